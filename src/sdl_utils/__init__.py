@@ -1,66 +1,74 @@
-# --- Core Functionality ---
-from .logger import get_logger
-# from .aws_iot import AWSIoTClient, connect_aws_iot, publish_message, subscribe_topic, disconnect_aws_iot
-from .socket import connect_socket, send_file_name, receive_file_name, send_file_size, receive_file_size, receive_file
-# Placeholder for future development
-# from .mqtt import ...
-# from .sqlite import ...
+"""
+SDL Utilities for lab workflow management.
 
-# Create a default logger for convenient use throughout the package
-logger = get_logger("sdl_utils_default")
+Submodules are loaded lazily (PEP 562): symbols resolve on first access,
+so `import sdl_utils` stays fast and scripts that only need the logger or
+socket helpers never pay for paho, prefect or slack_sdk imports.
+"""
 
-# --- Optional Prefect Functionality ---
-# Try to import Prefect components, but fail gracefully if not installed
-try:
-    from .prefect_runtime import is_worker_node
-    
-    if not is_worker_node():
-        # --- Orchestrator-specific functionality (Full Nodes Only) ---
-        try:
-            from .prefect_orchestrator import run_command_on_worker, request_slack_approval, example_shell_command_flow
-            from .slack_bot import slack_client, send_slack_message, ask_for_approval, await_approval_response
-            from prefect import flow, task
-            
-            # Add orchestrator functions to the public API
-            __all__.extend([
-                "flow",
-                "task", 
-                "run_command_on_worker",
-                "request_slack_approval",
-                "example_shell_command_flow",
-                "slack_client",
-                "send_slack_message",
-                "ask_for_approval",
-                "await_approval_response"
-            ])
-            
-        except ImportError:
-            # Fails gracefully if 'prefect-full' extras are not installed
-            logger.info("Prefect orchestration components not found. Install with 'pip install sdl-utils[prefect-full]' for full orchestration features.")
-    
-    else:
-        # --- Worker Node Functionality ---
-        # This can be expanded if worker-specific helper functions are added later
-        pass
-        
-except ImportError:
-    # Prefect runtime detection not available - this is fine for basic usage
-    logger.info("Prefect components not available. Install with 'pip install sdl-utils[prefect-worker]' or 'pip install sdl-utils[prefect-full]' for Prefect functionality.")
+import importlib
+
+# Symbol -> (submodule, attribute). Optional-extra symbols (prefect, slack)
+# only raise ImportError when actually accessed without the extras installed.
+_LAZY = {
+    # Logging
+    "get_logger": (".logger", "get_logger"),
+    # AWS IoT
+    "AWSIoTClient": (".aws_iot", "AWSIoTClient"),
+    "connect_aws_iot": (".aws_iot", "connect_aws_iot"),
+    "disconnect_aws_iot": (".aws_iot", "disconnect_aws_iot"),
+    "publish_message": (".aws_iot", "publish_message"),
+    "subscribe_topic": (".aws_iot", "subscribe_topic"),
+    # Socket file transfer
+    "connect_socket": (".socket", "connect_socket"),
+    "send_file_name": (".socket", "send_file_name"),
+    "receive_file_name": (".socket", "receive_file_name"),
+    "send_file_size": (".socket", "send_file_size"),
+    "send_file": (".socket", "send_file"),
+    "receive_file_size": (".socket", "receive_file_size"),
+    "receive_file": (".socket", "receive_file"),
+    "receive_file_to_path": (".socket", "receive_file_to_path"),
+    # Workflow client
+    "PrefectClient": (".prefect_client", "PrefectClient"),
+    "prefect_client": (".prefect_client", "prefect_client"),
+    "get_prefect_client": (".prefect_client", "get_prefect_client"),
+    "create_workflow": (".prefect_client", "create_workflow"),
+    # Worker-node detection
+    "is_worker_node": (".prefect_runtime", "is_worker_node"),
+    # Orchestration (requires the 'prefect-full' extras)
+    "run_command_on_worker": (".prefect_orchestrator", "run_command_on_worker"),
+    "deploy_task_to_worker": (".prefect_orchestrator", "deploy_task_to_worker"),
+    "deploy_tasks_to_workers": (".prefect_orchestrator", "deploy_tasks_to_workers"),
+    "request_slack_approval": (".prefect_orchestrator", "request_slack_approval"),
+    "example_shell_command_flow": (".prefect_orchestrator", "example_shell_command_flow"),
+    # Slack (requires the 'prefect-full' extras)
+    "slack_client": (".slack_bot", "slack_client"),
+    "send_slack_message": (".slack_bot", "send_slack_message"),
+    "ask_for_approval": (".slack_bot", "ask_for_approval"),
+    "await_approval_response": (".slack_bot", "await_approval_response"),
+    "SlackLoguruSink": (".slack_loguru_sink", "SlackLoguruSink"),
+    "get_slack_sink": (".slack_loguru_sink", "get_slack_sink"),
+}
 
 # --- Public API ---
 # This defines what `from sdl_utils import *` will import.
-__all__ = [
-    "get_logger",
-    "logger",
-    "AWSIoTClient",
-    "connect_aws_iot",
-    "publish_message",
-    "subscribe_topic",
-    "disconnect_aws_iot",
-    "connect_socket",
-    "send_file_name",
-    "receive_file_name",
-    "send_file_size",
-    "receive_file_size",
-    "receive_file",
-]
+__all__ = ["logger"] + sorted(_LAZY)
+
+
+def __getattr__(name):
+    if name == "logger":
+        # Default logger for convenient use throughout the package,
+        # created on first access rather than at import
+        value = __getattr__("get_logger")("sdl_utils_default")
+    elif name in _LAZY:
+        module_name, attr = _LAZY[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so subsequent lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,14 +7,72 @@ A lightweight AWS IoT client implementation for managing device connections and
 """
 
 import os
-import json
 import time
+import random
+import socket
 import logging
-from typing import Optional, Callable, Dict, Any
+import functools
+import threading
+from typing import Optional, Callable, Dict, Any, Union
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import ssl
+import orjson
 import paho.mqtt.client as mqtt
+import paho.mqtt.publish
 from paho.mqtt.client import MQTTMessage
+from paho.mqtt.properties import Properties
+from paho.mqtt.packettypes import PacketTypes
+
+
+# Upper bound on the exponential reconnect backoff, in seconds
+_MAX_BACKOFF = 30.0
+
+
+def _tcp_reachable(host: str, port: int, timeout: float = 0.2) -> bool:
+    """Cheap TCP probe: True if a connection to host:port opens in time."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_cached(items: tuple) -> bytes:
+    """Serialize a flat message given as a tuple of (key, type, value) triples.
+
+    Repeated telemetry payloads (same keys and values) are served from the
+    LRU cache instead of being re-serialized on every publish. The value's
+    type is part of the key because equal-comparing values can serialize
+    differently (1, True and 1.0 all hash equal but render as distinct JSON).
+    """
+    return orjson.dumps(
+        {key: value for key, _vtype, value in items},
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _encode_payload(message: Any) -> bytes:
+    """Encode a message to bytes for paho, caching repeated flat dicts."""
+    if isinstance(message, bytes):
+        return message
+    if isinstance(message, str):
+        return message.encode("utf-8")
+    if isinstance(message, dict):
+        try:
+            # Only flat dicts of hashable values are cacheable
+            return _encode_cached(
+                tuple((k, type(v), v) for k, v in sorted(message.items()))
+            )
+        except TypeError:
+            pass
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _dispatch_message(client: mqtt.Client, userdata: "AWSIoTClient", message: MQTTMessage) -> None:
+    """paho on_message hook; userdata carries the owning AWSIoTClient."""
+    userdata._handle_message(message)
 
 class AWSIoTClient:
     """Lightweight AWS IoT client for resource-constrained devices."""
@@ -24,11 +82,14 @@ class AWSIoTClient:
         endpoint: Optional[str] = None,
         port: int = 8883,
         client_id: Optional[str] = None,
-        cert_path: Optional[Path] = None,
-        key_path: Optional[Path] = None,
-        ca_path: Optional[Path] = None,
+        cert_path: Optional[Union[str, Path]] = None,
+        key_path: Optional[Union[str, Path]] = None,
+        ca_path: Optional[Union[str, Path]] = None,
         max_retries: int = 3,
-        retry_delay: int = 5
+        retry_delay: int = 5,
+        batch_interval_ms: int = 5,
+        handler_workers: int = 4,
+        ordered: bool = False
     ):
         """Initialize the AWS IoT client.
         
@@ -41,13 +102,19 @@ class AWSIoTClient:
             ca_path: Path to CA certificate file
             max_retries: Maximum number of retry attempts
             retry_delay: Delay between retries in seconds
+            batch_interval_ms: Flush window for publish_batched in milliseconds
+            handler_workers: Size of the pool that runs message handlers
+            ordered: Run each topic's handler on its own single worker so
+                per-topic message ordering is preserved
         """
         self.endpoint = endpoint or os.getenv("AWS_IOT_ENDPOINT")
         self.port = port
         self.client_id = client_id or os.getenv("AWS_IOT_CLIENT_ID", os.uname().nodename)
-        self.cert_path = cert_path or Path(os.getenv("AWS_IOT_CERT_PATH", "cert.pem"))
-        self.key_path = key_path or Path(os.getenv("AWS_IOT_KEY_PATH", "private.key"))
-        self.ca_path = ca_path or Path(os.getenv("AWS_IOT_CA_PATH", "root-CA.crt"))
+        # Stored as plain strings: everything downstream (os.stat, the ssl
+        # module, paho's tls helpers) wants str, and pathlib adds overhead
+        self.cert_path = str(cert_path or os.getenv("AWS_IOT_CERT_PATH", "cert.pem"))
+        self.key_path = str(key_path or os.getenv("AWS_IOT_KEY_PATH", "private.key"))
+        self.ca_path = str(ca_path or os.getenv("AWS_IOT_CA_PATH", "root-CA.crt"))
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
@@ -55,46 +122,102 @@ class AWSIoTClient:
         self.logger = logging.getLogger("aws_iot")
         self.logger.setLevel(logging.INFO)
         
-        # Initialize MQTT client
-        self.client = mqtt.Client(client_id=self.client_id)
+        # Initialize MQTT client. MQTTv5 with a persistent session keeps
+        # subscriptions alive on the broker across reconnects.
+        self.client = mqtt.Client(client_id=self.client_id, protocol=mqtt.MQTTv5)
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
-        self.client.on_message = self._on_message
-        self.client.on_publish = self._on_publish
+        # Pass ourselves as userdata so the message callback is a plain
+        # module function — no bound-method allocation per received packet
+        self.client.user_data_set(self)
+        self.client.on_message = _dispatch_message
+        # paho skips a callback that is left unset, so only pay for the
+        # per-publish callback when debug logging will actually use it
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.client.on_publish = self._on_publish
+        self.client.on_socket_open = self._on_socket_open
         
-        # Message handlers
+        # Message handlers run on a pool so slow handlers (disk, Slack, DB)
+        # never stall paho's single network thread
         self.message_handlers: Dict[str, Callable] = {}
+        # Intended subscriptions, replayed only when the broker reports no
+        # existing session for this client
+        self._subscriptions: Dict[str, int] = {}
+        self.ordered = ordered
+        self.handler_workers = handler_workers
+        self._handler_pool = ThreadPoolExecutor(max_workers=handler_workers)
+        self._topic_pools: Dict[str, ThreadPoolExecutor] = {}
+        self._pools_closed = False
+
+        # Batched publishing (opt-in via publish_batched)
+        self.batch_interval_ms = batch_interval_ms
+        self._batch_queues: Dict[str, list] = {}
+        self._batch_qos: Dict[str, int] = {}
+        self._batch_lock = threading.Lock()
+        self._batch_stop = threading.Event()
+        self._batch_thread: Optional[threading.Thread] = None
         
         # Connection state
         self.connected = False
         self.connection_error = None
+        self._config_validated = False
+        self._tls_configured = False
 
     def connect(self) -> bool:
         """Connect to AWS IoT with retry logic."""
         if not self._validate_config():
             return False
-            
+
+        # disconnect() shuts the handler pools down; rebuild them so a
+        # disconnect()/connect() cycle yields a client that still runs
+        # handlers instead of dropping every message
+        if self._pools_closed:
+            self._handler_pool = ThreadPoolExecutor(max_workers=self.handler_workers)
+            self._topic_pools = {}
+            self._pools_closed = False
+
         for attempt in range(self.max_retries):
             try:
                 self._setup_ssl()
-                self.client.connect(self.endpoint, self.port, keepalive=60)
+                # Ask the broker to keep the session (and its subscriptions)
+                # for an hour, so reconnects skip the re-subscribe round trips
+                props = Properties(PacketTypes.CONNECT)
+                props.SessionExpiryInterval = 3600
+                self.client.connect(
+                    self.endpoint, self.port, keepalive=60,
+                    clean_start=False, properties=props
+                )
                 self.client.loop_start()
+                self._start_batch_thread()
                 return True
             except Exception as e:
                 self.connection_error = str(e)
                 if attempt == self.max_retries - 1:
                     self.logger.error(f"Failed to connect after {self.max_retries} attempts: {str(e)}")
                     return False
-                self.logger.warning(f"Connection attempt {attempt + 1} failed, retrying in {self.retry_delay} seconds...")
-                time.sleep(self.retry_delay)
+                # Exponential backoff with jitter; poll the broker port while
+                # waiting so recovery happens as soon as it is reachable
+                # rather than after the full delay
+                delay = min(_MAX_BACKOFF, self.retry_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                self.logger.warning(f"Connection attempt {attempt + 1} failed, retrying in {delay:.1f} seconds...")
+                sleep_until = time.monotonic() + delay
+                while time.monotonic() < sleep_until:
+                    if _tcp_reachable(self.endpoint, self.port):
+                        break
+                    time.sleep(0.05)
         return False
 
     def disconnect(self) -> None:
         """Disconnect from AWS IoT."""
         if self.connected:
+            self._stop_batch_thread()
             self.client.loop_stop()
             self.client.disconnect()
             self.connected = False
+        self._handler_pool.shutdown(wait=False)
+        for pool in self._topic_pools.values():
+            pool.shutdown(wait=False)
+        self._pools_closed = True
 
     def publish(self, topic: str, message: Any, qos: int = 0) -> bool:
         """Publish a message to a topic."""
@@ -103,14 +226,118 @@ class AWSIoTClient:
             return False
             
         try:
-            if not isinstance(message, str):
-                message = json.dumps(message)
-            result = self.client.publish(topic, message, qos=qos)
+            # Hand bytes straight to paho so it skips its own str-encode
+            payload = _encode_payload(message)
+            result = self.client.publish(topic, payload, qos=qos)
             return result.rc == mqtt.MQTT_ERR_SUCCESS
         except Exception as e:
             self.logger.error(f"Failed to publish message: {str(e)}")
             return False
 
+    def publish_many(self, msgs: list, qos: int = 0) -> bool:
+        """Publish many (topic, message) pairs over a single connection.
+
+        Forwards to paho's publish.multiple helper, which bundles all
+        messages over one TLS handshake and keepalive cycle instead of
+        paying per-call overhead in an application loop.
+
+        Args:
+            msgs: List of (topic, message) tuples
+            qos: QoS level applied to every message
+        """
+        if not self._validate_config():
+            return False
+
+        payloads = [
+            {"topic": topic, "payload": _encode_payload(message), "qos": qos}
+            for topic, message in msgs
+        ]
+        try:
+            paho.mqtt.publish.multiple(
+                payloads,
+                hostname=self.endpoint,
+                port=self.port,
+                client_id=f"{self.client_id}-bulk",
+                tls=self._tls_args(),
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to publish message batch: {str(e)}")
+            return False
+
+    def _tls_args(self) -> Dict[str, Any]:
+        """TLS settings in the dict form paho's helper functions accept."""
+        return {
+            "ca_certs": self.ca_path,
+            "certfile": self.cert_path,
+            "keyfile": self.key_path,
+            "cert_reqs": ssl.CERT_REQUIRED,
+            "tls_version": ssl.PROTOCOL_TLSv1_2,
+        }
+
+    def publish_batched(self, topic: str, message: Any, qos: int = 0, max_batch: int = 100) -> bool:
+        """Queue a message for batched publishing.
+
+        Messages queued for the same topic within the flush window
+        (batch_interval_ms) are coalesced into a single JSON-array payload,
+        amortizing broker round trips for high-rate sensor telemetry. Use
+        plain publish() for latency-sensitive messages.
+
+        Args:
+            topic: Topic to publish to
+            message: JSON-serializable message to queue
+            qos: QoS level for the coalesced publish
+            max_batch: Flush immediately once this many messages are queued
+        """
+        if not self.connected:
+            self.logger.error("Not connected to AWS IoT")
+            return False
+
+        with self._batch_lock:
+            queue = self._batch_queues.setdefault(topic, [])
+            queue.append(message)
+            self._batch_qos[topic] = qos
+            flush_now = len(queue) >= max_batch
+        if flush_now:
+            self._flush_batches()
+        return True
+
+    def _start_batch_thread(self) -> None:
+        """Start the background thread that flushes batched publishes."""
+        if self._batch_thread is not None and self._batch_thread.is_alive():
+            return
+        self._batch_stop.clear()
+        self._batch_thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self._batch_thread.start()
+
+    def _stop_batch_thread(self) -> None:
+        """Stop the batch thread and flush any queued messages."""
+        self._batch_stop.set()
+        if self._batch_thread is not None:
+            self._batch_thread.join(timeout=1.0)
+            self._batch_thread = None
+        self._flush_batches()
+
+    def _batch_loop(self) -> None:
+        """Flush queued batches every batch_interval_ms until stopped."""
+        while not self._batch_stop.wait(self.batch_interval_ms / 1000.0):
+            self._flush_batches()
+
+    def _flush_batches(self) -> None:
+        """Publish each topic's queued messages as one JSON-array payload."""
+        with self._batch_lock:
+            if not self._batch_queues:
+                return
+            batches = self._batch_queues
+            qos_map = self._batch_qos
+            self._batch_queues = {}
+            self._batch_qos = {}
+        for topic, batch in batches.items():
+            try:
+                self.client.publish(topic, orjson.dumps(batch), qos=qos_map.get(topic, 0))
+            except Exception as e:
+                self.logger.error(f"Failed to publish batch to {topic}: {str(e)}")
+
     def subscribe(self, topic: str, callback: Callable[[str, Any], None], qos: int = 0) -> bool:
         """Subscribe to a topic with a callback function."""
         if not self.connected:
@@ -119,6 +346,7 @@ class AWSIoTClient:
             
         try:
             self.message_handlers[topic] = callback
+            self._subscriptions[topic] = qos
             result = self.client.subscribe(topic, qos=qos)
             return result[0] == mqtt.MQTT_ERR_SUCCESS
         except Exception as e:
@@ -126,88 +354,153 @@ class AWSIoTClient:
             return False
 
     def _validate_config(self) -> bool:
-        """Validate the AWS IoT configuration."""
+        """Validate the AWS IoT configuration.
+
+        The result is cached after the first success so retry loops do not
+        re-stat the same certificate files on every attempt.
+        """
+        if self._config_validated:
+            return True
+
         if not self.endpoint:
             self.logger.error("AWS IoT endpoint not configured")
             return False
-            
-        if not self.cert_path.exists():
-            self.logger.error(f"Certificate file not found: {self.cert_path}")
-            return False
-            
-        if not self.key_path.exists():
-            self.logger.error(f"Private key file not found: {self.key_path}")
-            return False
-            
-        if not self.ca_path.exists():
-            self.logger.error(f"CA certificate file not found: {self.ca_path}")
-            return False
-            
+
+        for path, label in (
+            (self.cert_path, "Certificate"),
+            (self.key_path, "Private key"),
+            (self.ca_path, "CA certificate"),
+        ):
+            try:
+                os.stat(path)
+            except OSError:
+                self.logger.error(f"{label} file not found: {path}")
+                return False
+
+        self._config_validated = True
         return True
 
+    @functools.cached_property
+    def _ssl_ctx(self) -> ssl.SSLContext:
+        """TLS context for this client, built lazily and exactly once.
+
+        PEM parsing and X509 store construction are the most expensive part
+        of connect() on small worker nodes; caching the context means they
+        happen a single time no matter how many reconnects follow.
+        """
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+        ctx.verify_mode = ssl.CERT_REQUIRED
+        ctx.check_hostname = True
+        ctx.load_cert_chain(certfile=self.cert_path, keyfile=self.key_path)
+        ctx.load_verify_locations(cafile=self.ca_path)
+        return ctx
+
     def _setup_ssl(self) -> None:
-        """Setup SSL context for secure connection."""
-        self.client.tls_set(
-            ca_certs=str(self.ca_path),
-            certfile=str(self.cert_path),
-            keyfile=str(self.key_path),
-            cert_reqs=ssl.CERT_REQUIRED,
-            tls_version=ssl.PROTOCOL_TLSv1_2,
-            ciphers=None
-        )
-
-    def _on_connect(self, client: mqtt.Client, userdata: Any, flags: Dict, rc: int) -> None:
+        """Hand the shared SSL context to paho (first call only).
+
+        Reusing one context across reconnects also keeps the OpenSSL
+        session cache warm so resumed handshakes skip the full
+        certificate exchange.
+        """
+        if self._tls_configured:
+            return
+        self.client.tls_set_context(self._ssl_ctx)
+        self._tls_configured = True
+
+    def _on_socket_open(self, client: mqtt.Client, userdata: Any, sock) -> None:
+        """Disable Nagle on the freshly opened socket.
+
+        Small QoS0 publishes otherwise sit behind delayed ACKs for up to
+        40 ms; TCP_NODELAY sends them immediately.
+        """
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
+    def _on_connect(self, client: mqtt.Client, userdata: Any, flags: Any, rc: Any, properties: Any = None) -> None:
         """Handle connection events."""
-        if rc == 0:
+        failed = rc.is_failure if hasattr(rc, "is_failure") else rc != 0
+        if not failed:
             self.connected = True
             self.connection_error = None
             self.logger.info("Connected to AWS IoT")
+            # Only replay subscriptions when the broker has no session for
+            # us; with a resumed session they are still active server-side
+            if isinstance(flags, dict):
+                session_present = bool(flags.get("session present"))
+            else:
+                session_present = bool(getattr(flags, "session_present", False))
+            if not session_present:
+                for topic, qos in self._subscriptions.items():
+                    client.subscribe(topic, qos=qos)
         else:
             self.connected = False
             self.connection_error = f"Connection failed with code {rc}"
             self.logger.error(self.connection_error)
 
-    def _on_disconnect(self, client: mqtt.Client, userdata: Any, rc: int) -> None:
+    def _on_disconnect(self, client: mqtt.Client, userdata: Any, rc: Any, properties: Any = None) -> None:
         """Handle disconnection events."""
         self.connected = False
         if rc != 0:
             self.logger.warning(f"Unexpected disconnection with code {rc}")
 
-    def _on_message(self, client: mqtt.Client, userdata: Any, message: MQTTMessage) -> None:
+    def _handle_message(self, message: MQTTMessage) -> None:
         """Handle incoming messages."""
         try:
             topic = message.topic
-            payload = message.payload.decode()
-            try:
-                payload = json.loads(payload)
-            except json.JSONDecodeError:
-                pass
-                
+            raw = message.payload
+            # Peek at the first byte to decide whether this looks like JSON,
+            # so plain-text payloads skip a guaranteed-to-fail parse attempt
+            if raw[:1] in (b'{', b'[', b'"'):
+                try:
+                    payload = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    payload = raw.decode('utf-8', 'replace')
+            else:
+                payload = raw.decode('utf-8', 'replace')
+
             if topic in self.message_handlers:
-                self.message_handlers[topic](topic, payload)
+                self._handler_pool_for(topic).submit(
+                    self.message_handlers[topic], topic, payload
+                )
         except Exception as e:
             self.logger.error(f"Error processing message: {str(e)}")
 
+    def _handler_pool_for(self, topic: str) -> ThreadPoolExecutor:
+        """Return the executor that should run handlers for a topic."""
+        if not self.ordered:
+            return self._handler_pool
+        pool = self._topic_pools.get(topic)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=1)
+            self._topic_pools[topic] = pool
+        return pool
+
     def _on_publish(self, client: mqtt.Client, userdata: Any, mid: int) -> None:
         """Handle successful message publishing."""
         self.logger.debug(f"Message {mid} published successfully")
 
-# Create default client instance
-aws_iot_client = AWSIoTClient()
+# Default client, created lazily on first use so importing this module
+# does not read env vars or allocate a paho client for scripts that
+# never touch AWS IoT
+@functools.cache
+def _default_client() -> AWSIoTClient:
+    return AWSIoTClient()
 
 # Convenience functions
 def connect_aws_iot() -> bool:
     """Connect to AWS IoT."""
-    return aws_iot_client.connect()
+    return _default_client().connect()
 
 def disconnect_aws_iot() -> None:
     """Disconnect from AWS IoT."""
-    aws_iot_client.disconnect()
+    _default_client().disconnect()
 
 def publish_message(topic: str, message: Any, qos: int = 0) -> bool:
     """Publish a message to a topic."""
-    return aws_iot_client.publish(topic, message, qos=qos)
+    return _default_client().publish(topic, message, qos=qos)
 
 def subscribe_topic(topic: str, callback: Callable[[str, Any], None], qos: int = 0) -> bool:
     """Subscribe to a topic with a callback function."""
-    return aws_iot_client.subscribe(topic, callback, qos=qos) 
\ No newline at end of file
+    return _default_client().subscribe(topic, callback, qos=qos) 
\ No newline at end of file
@@ -9,14 +9,36 @@ A list of functions:
 
 import os
 import sys
+import queue
+import atexit
 import socket
 import getpass
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
+# Hostname and username are invariant for the process lifetime, so resolve
+# them once at import instead of issuing the syscalls per get_logger call
+_HOSTNAME = socket.gethostname()
+_USERNAME = getpass.getuser()
+_LOGS_DIR = os.path.join(os.path.expanduser("~"), "Logs")
+_logs_dir_created = False
+
+# Timestamp shared by all loggers created in this process, so the several
+# loggers a workflow sets up at startup land in files with one common stem
+_PROC_TIMESTAMP = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+# One shared Formatter: the format string is parsed once and every handler
+# reuses the same instance instead of rebuilding it per get_logger call
+_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s - [%(levelname)s] - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
 
 def get_logger(
-        logger_name: str
+        logger_name: str,
+        unique_timestamp: bool = False
 ) -> logging.Logger:
 
     """
@@ -25,46 +47,53 @@ def get_logger(
     The log file is placed in the ~/Logs directory.
 
     :param logger_name: The name of the logger to create.
+    :param unique_timestamp: Use a fresh per-call timestamp instead of the
+        shared process-start timestamp.
     :return: A configured logger instance.
     """
 
-    # Get the local machine name (computer name)
-    hostname = socket.gethostname()
-    # Get the local user who is running this script
-    username = getpass.getuser()
-
-    # Create a "Logs" folder in the user's home directory if it doesn't exist
+    # Create the "Logs" folder in the user's home directory on first use
     # These logs and then be backed up using another utility
-    logs_dir = os.path.join(os.path.expanduser("~"), "Logs")
-    os.makedirs(logs_dir, exist_ok=True)
+    global _logs_dir_created
+    if not _logs_dir_created:
+        os.makedirs(_LOGS_DIR, exist_ok=True)
+        _logs_dir_created = True
 
-    # Generate a timestamp for the log filename
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # Use the shared process-start timestamp unless a fresh one is requested
+    if unique_timestamp:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    else:
+        timestamp = _PROC_TIMESTAMP
 
     # Build the log filename and path
-    log_filename = f"{hostname}_{username}_{logger_name}_{timestamp}.log"
-    log_path = os.path.join(logs_dir, log_filename)
+    log_filename = f"{_HOSTNAME}_{_USERNAME}_{logger_name}_{timestamp}.log"
+    log_path = os.path.join(_LOGS_DIR, log_filename)
 
     # Create and configure the logger
     logger = logging.getLogger(logger_name)
     logger.setLevel(logging.DEBUG)
 
+    # Avoid adding multiple handlers if logger is already used
+    if logger.handlers:
+        return logger
+
     # Create a file handler to write logs to our log file
     file_handler = logging.FileHandler(log_path)
     file_handler.setLevel(logging.DEBUG)
 
     # Set a log message format
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - [%(levelname)s] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(formatter)
-
-    # Avoid adding multiple handlers if logger is already used
-    if not logger.handlers:
-        logger.addHandler(file_handler)
+    file_handler.setFormatter(_FORMATTER)
 
     # Also output the stout by streaming the output
-    logger.addHandler(logging.StreamHandler(sys.stdout))
+    stream_handler = logging.StreamHandler(sys.stdout)
+
+    # Hand records off through a queue so log calls never block on disk
+    # writes or stdout flushes; a background listener owns the real handlers
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
 
     return logger
@@ -0,0 +1,378 @@
+"""
+Lightweight Prefect-style workflow client for SDL
+Author: Yang Cao, Acceleration Consortium
+Version: 0.1
+
+Runs locally registered workflow functions with retry and a small on-disk
+state cache, so failed runs can be inspected and retried without a full
+Prefect server round trip.
+
+A list of functions:
+ - PrefectClient (class)
+ - create_workflow (decorator)
+"""
+
+import os
+import time
+import uuid
+import pickle
+import random
+import inspect
+import logging
+import functools
+import threading
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:
+    # State files fall back to JSON when msgpack is unavailable
+    msgpack = None
+
+try:
+    from blake3 import blake3 as _hash_fn
+except ImportError:
+    # blake2b is in the stdlib and plenty fast for cache keys
+    from hashlib import blake2b as _hash_fn
+
+# Workflows registered via create_workflow, keyed by function name so
+# retry_workflow can find the callable for a cached run
+_workflow_registry: Dict[str, Callable] = {}
+
+# Statuses after which a workflow's state will not change again
+_TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+# Defaults resolved once at import instead of per instance
+_DEFAULT_API_URL = os.getenv("PREFECT_API_URL")
+_DEFAULT_API_KEY = os.getenv("PREFECT_API_KEY")
+_DEFAULT_CACHE_DIR = Path.home() / ".sdl_prefect" / "cache"
+_LOGGER = logging.getLogger("prefect_client")
+_LOGGER.setLevel(logging.INFO)
+
+
+class PrefectClient:
+    """Lightweight workflow runner with an on-disk state cache."""
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        max_retries: int = 3,
+        retry_delay: int = 5,
+        retry_cap: int = 60
+    ):
+        """Initialize the workflow client.
+
+        Args:
+            api_url: Prefect API URL (defaults to PREFECT_API_URL env var)
+            api_key: Prefect API key (defaults to PREFECT_API_KEY env var)
+            cache_dir: Directory for workflow state files
+            max_retries: Maximum number of retry attempts per workflow
+            retry_delay: Base delay between retries in seconds
+            retry_cap: Upper bound on the backoff delay in seconds
+        """
+        self.api_url = api_url or _DEFAULT_API_URL
+        self.api_key = api_key or _DEFAULT_API_KEY
+        self.cache_dir = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_cap = retry_cap
+
+        # Write-behind buffer for state updates; flushed by a short timer
+        # or immediately on a terminal status
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # Parsed state files keyed by workflow_id -> (st_mtime_ns, state),
+        # so repeated status checks skip re-reading unchanged files
+        self._state_cache: Dict[str, tuple] = {}
+
+        # Setup logging (shared module logger, configured once at import)
+        self.logger = _LOGGER
+
+        # Imported here rather than at module top: requests drags in
+        # urllib3 and friends, and per-task worker invocations import this
+        # module without ever making an API call
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        # One pooled HTTP session for all API calls: keep-alive connections
+        # skip repeated DNS/TCP/TLS handshakes, and urllib3's Retry handles
+        # backoff for transient server errors
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=self.max_retries,
+                backoff_factor=self.retry_delay,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if self.api_key:
+            self._session.headers["Authorization"] = f"Bearer {self.api_key}"
+
+    def run_workflow(self, workflow_func: Callable, *args, workflow_id: Optional[str] = None, **kwargs) -> Any:
+        """Run a workflow function with retry and state caching.
+
+        The workflow state (status, arguments, result or error) is written
+        to the cache directory so a failed run can be retried later via
+        retry_workflow.
+        """
+        workflow_id = workflow_id or f"{workflow_func.__name__}-{uuid.uuid4().hex[:8]}"
+        self._update_workflow_state(
+            workflow_id,
+            workflow_name=workflow_func.__name__,
+            status="running",
+            args=list(args),
+            kwargs=kwargs,
+        )
+
+        last_error = None
+        for attempt in range(self.max_retries):
+            try:
+                result = workflow_func(*args, **kwargs)
+                self._update_workflow_state(workflow_id, status="completed", result=result)
+                return result
+            except Exception as e:
+                last_error = str(e)
+                if attempt < self.max_retries - 1:
+                    # Full-jitter exponential backoff: drawing uniformly from
+                    # [0, capped exponential delay] spreads a fleet's retries
+                    # out in time instead of re-stampeding all at once
+                    delay = random.uniform(0, min(self.retry_cap, self.retry_delay * (2 ** attempt)))
+                    self.logger.warning(
+                        f"Workflow {workflow_id} attempt {attempt + 1} failed, "
+                        f"retrying in {delay:.1f} seconds..."
+                    )
+                    time.sleep(delay)
+
+        self.logger.error(f"Workflow {workflow_id} failed after {self.max_retries} attempts: {last_error}")
+        self._update_workflow_state(workflow_id, status="failed", error=last_error)
+        raise RuntimeError(f"Workflow {workflow_id} failed: {last_error}")
+
+    def retry_workflow(self, workflow_id: str) -> Any:
+        """Re-run a previously failed workflow from its cached state."""
+        state = self._load_workflow_state(workflow_id)
+        if state is None:
+            raise ValueError(f"No cached state for workflow {workflow_id}")
+
+        workflow_func = _workflow_registry.get(state.get("workflow_name", ""))
+        if workflow_func is None:
+            raise ValueError(
+                f"Workflow function '{state.get('workflow_name')}' is not registered; "
+                "decorate it with @create_workflow first"
+            )
+
+        return self.run_workflow(
+            workflow_func,
+            *state.get("args", []),
+            workflow_id=workflow_id,
+            **state.get("kwargs", {}),
+        )
+
+    def get_workflow_status(self, workflow_id: str) -> Optional[str]:
+        """Return the cached status of a workflow, or None if unknown."""
+        state = self._load_workflow_state(workflow_id)
+        return state.get("status") if state else None
+
+    def _cache_file(self, workflow_id: str) -> Path:
+        return self.cache_dir / f"{workflow_id}.json"
+
+    def _update_workflow_state(self, workflow_id: str, **changes: Any) -> None:
+        """Merge changes into a workflow's cached state.
+
+        Writes are debounced: updates accumulate in memory and flush to
+        disk after 100 ms, or immediately on a terminal status, so a burst
+        of status transitions costs one file write instead of one each —
+        easy on SD-card-backed worker nodes.
+        """
+        changes["updated_at"] = time.time()
+        terminal = changes.get("status") in _TERMINAL_STATUSES
+        with self._pending_lock:
+            pending = self._pending.setdefault(workflow_id, {"workflow_id": workflow_id})
+            pending.update(changes)
+            if not terminal and self._flush_timer is None:
+                self._flush_timer = threading.Timer(0.1, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if terminal:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending workflow state updates to disk."""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+        for workflow_id, changes in pending.items():
+            state = self._read_state_file(workflow_id) or {"workflow_id": workflow_id}
+            state.update(changes)
+            self._save_workflow_state(workflow_id, state)
+
+    def close(self) -> None:
+        """Flush any pending workflow state before discarding the client."""
+        self.flush()
+
+    def __del__(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def _save_workflow_state(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        """Atomically write a workflow state file.
+
+        The payload is serialized with msgpack (smaller and faster than
+        JSON, which also means fewer bytes written to SD cards) and written
+        to a temp file that is moved into place with os.replace, so a crash
+        mid-write can never leave a truncated state file behind for
+        retry_workflow.
+        """
+        cache_file = self._cache_file(workflow_id)
+        try:
+            buf = self._pack(state)
+        except TypeError:
+            # Results that are not serializable are cached without the
+            # result payload rather than losing the run record entirely
+            state = {k: v for k, v in state.items() if k != "result"}
+            buf = self._pack(state)
+        tmp = cache_file.with_suffix(".json.tmp")
+        tmp.write_bytes(buf)
+        os.replace(tmp, cache_file)
+        # What we just wrote is what a re-read would parse
+        self._state_cache[workflow_id] = (cache_file.stat().st_mtime_ns, state)
+
+    @staticmethod
+    def _pack(state: Dict[str, Any]) -> bytes:
+        if msgpack is not None:
+            return msgpack.packb(state, use_bin_type=True)
+        return orjson.dumps(state)
+
+    def _load_workflow_state(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a workflow, or None if it is unknown.
+
+        Reads through the pending write-behind buffer first, so callers
+        always see updates that have not hit the disk yet.
+        """
+        state = self._read_state_file(workflow_id)
+        with self._pending_lock:
+            pending = self._pending.get(workflow_id)
+            if pending:
+                state = dict(state) if state else {}
+                state.update(pending)
+        return state
+
+    def _read_state_file(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Load a workflow's on-disk state, or None if it does not exist.
+
+        State files written by older versions are JSON; a msgpack-encoded
+        dict never starts with '{', so the first byte tells the formats
+        apart and both load transparently. Parses are cached against the
+        file's mtime, so the cost is only paid when the file has actually
+        changed on disk.
+        """
+        cache_file = self._cache_file(workflow_id)
+        try:
+            mtime_ns = cache_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._state_cache.pop(workflow_id, None)
+            return None
+        cached = self._state_cache.get(workflow_id)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            buf = cache_file.read_bytes()
+            if buf[:1] == b"{" or msgpack is None:
+                state = orjson.loads(buf)
+            else:
+                state = msgpack.unpackb(buf, raw=False)
+        except Exception:
+            self.logger.error(f"Corrupt state file for workflow {workflow_id}: {cache_file}")
+            return None
+        self._state_cache[workflow_id] = (mtime_ns, state)
+        return state
+
+
+def _result_cache_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    """Content hash of a workflow's source plus its call arguments.
+
+    Editing the function or calling it with different arguments yields a
+    different key, so stale cached results are never served.
+    """
+    try:
+        src = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        src = func.__qualname__.encode()
+    return _hash_fn(src + pickle.dumps((args, kwargs))).hexdigest()
+
+
+def create_workflow(func: Optional[Callable] = None, *, cache: bool = False) -> Callable:
+    """Register a function as a retryable workflow.
+
+    The wrapped function runs through the default client's run_workflow,
+    gaining retry and state caching, and becomes discoverable by
+    retry_workflow. With @create_workflow(cache=True), results of pure
+    workflows are stored content-addressed under <cache_dir>/results,
+    keyed on the function source and arguments; a cache hit skips the
+    whole function body.
+    """
+    if func is None:
+        return functools.partial(create_workflow, cache=cache)
+
+    _workflow_registry[func.__name__] = func
+
+    def wrapper(*args, **kwargs):
+        client = get_prefect_client()
+        if cache:
+            key = _result_cache_key(func, args, kwargs)
+            result_file = client.cache_dir / "results" / key
+            try:
+                buf = result_file.read_bytes()
+                if buf[:1] == b"{" or msgpack is None:
+                    return orjson.loads(buf)["result"]
+                return msgpack.unpackb(buf, raw=False)["result"]
+            except FileNotFoundError:
+                pass
+            except Exception:
+                _LOGGER.warning(f"Ignoring unreadable cached result: {result_file}")
+        result = client.run_workflow(func, *args, **kwargs)
+        if cache:
+            try:
+                result_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = result_file.with_suffix(".tmp")
+                tmp.write_bytes(PrefectClient._pack({"result": result}))
+                os.replace(tmp, result_file)
+            except TypeError:
+                # Unserializable results simply are not cached
+                pass
+        return result
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+# Default client, created lazily on first use so importing this module
+# does not read env vars or mkdir the cache directory
+@functools.cache
+def get_prefect_client() -> PrefectClient:
+    return PrefectClient()
+
+
+def __getattr__(name):
+    # Keep the old module attribute working without eager construction
+    if name == "prefect_client":
+        return get_prefect_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,166 @@
+import json
+import shlex
+import asyncio
+import threading
+import subprocess
 from prefect import task, get_run_logger, flow
 from prefect.tasks import task_input_hash
 from datetime import timedelta
 from prefect_shell import ShellTask
 from .slack_bot import ask_for_approval, await_approval_response, send_slack_message
 
+# Shared, immutable task options built once at import: every task that
+# dispatches work to a worker reuses the same timedelta/tuple/hash-fn
+# objects instead of rebuilding them per decoration
+_CACHE_EXPIRATION = timedelta(minutes=30)
+_WORKER_TAGS = ("worker", "shell")
+_WORKER_TASK_OPTIONS = dict(
+    retries=3,
+    retry_delay_seconds=5,
+    cache_key_fn=task_input_hash,
+    cache_expiration=_CACHE_EXPIRATION,
+    tags=_WORKER_TAGS,
+)
+
+# OpenSSH connection multiplexing: the first dispatch to a worker opens a
+# master connection that later dispatches reuse for 10 minutes, so only
+# the first task pays the TCP + key-exchange + auth handshake
+_SSH_MULTIPLEX_OPTS = (
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=/tmp/sdl-ssh-%C",
+    "-o", "ControlPersist=600",
+)
+
+def _remote_worker_command(command_to_run: str) -> list:
+    """
+    Build the quoted remote tokens that invoke the worker runner.
+
+    Both dispatch paths join these with spaces on the remote shell's side,
+    so quoting each token keeps the remote argv identical to the local
+    shlex.split regardless of entry point.
+    """
+    return [
+        shlex.quote(tok)
+        for tok in ("python", "-m", "sdl_utils.prefect_worker", *shlex.split(command_to_run))
+    ]
+
 # This task will be executed by a worker.
 # It uses prefect-shell to run a command in the worker's environment.
 run_command_on_worker = ShellTask(
     name="Run Shell Command on Worker",
     helper_script="cd ~", # Example: ensures command runs in home directory
     stream_output=True,
-    tags=["worker", "shell"]
+    tags=list(_WORKER_TAGS)
 )
 
+@task(name="Deploy Task to Worker", **_WORKER_TASK_OPTIONS)
+def deploy_task_to_worker(worker_address: str, command_to_run: str) -> dict:
+    """
+    Runs a command on a remote worker via its sdl_utils.prefect_worker
+    runner and returns the worker's JSON result.
+
+    The ssh invocation is built as an argv list and executed without a
+    shell on the orchestrator side (no sh -c fork); each remote token is
+    shlex.quote'd so the remote shell reconstructs exactly the argv we
+    split locally -- quoted arguments survive intact and $(...)/; in the
+    command are passed through as data instead of being expanded.
+
+    Args:
+        worker_address: SSH destination of the worker (e.g. user@host).
+        command_to_run: Command for the worker to execute.
+
+    Returns:
+        The worker's result dict (returncode, stdout, stderr).
+    """
+    logger = get_run_logger()
+    # ssh joins its trailing argv with spaces and hands the result to the
+    # remote shell, so quote every remote token to keep the remote argv
+    # identical to the local split
+    argv = [
+        "ssh", *_SSH_MULTIPLEX_OPTS, worker_address,
+        *_remote_worker_command(command_to_run),
+    ]
+    logger.info(f"Dispatching to {worker_address}: {command_to_run}")
+    # The worker echoes its command's stdout line by line as it runs, so
+    # long-running commands show up live in the Prefect logs; the final
+    # line is the worker's JSON result and is kept for parsing below
+    last_line = None
+    stderr_chunks = []
+    with subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    ) as proc:
+        # Drain stderr on its own thread: a remote that writes more than a
+        # pipe buffer of stderr (long tracebacks, verbose ssh diagnostics)
+        # while stdout is still open would otherwise block and deadlock
+        # the stdout loop below
+        drain = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+        )
+        drain.start()
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                logger.info(line)
+                last_line = line
+        drain.join()
+    stderr = "".join(stderr_chunks)
+    # No stdout at all means the dispatch itself failed (unreachable host,
+    # rejected auth, runner crash before printing) -- surface the stderr as
+    # a task failure instead of handing json.loads a None
+    if proc.returncode != 0 or last_line is None:
+        logger.error(f"Worker task failed on {worker_address}: {stderr.strip()}")
+        raise RuntimeError(
+            f"worker dispatch to {worker_address} failed: {stderr.strip()}"
+        )
+    # The worker prints its result as the final JSON line
+    return json.loads(last_line)
+
+async def deploy_task_to_worker_async(worker_address: str, command_to_run: str) -> dict:
+    """
+    Async variant of deploy_task_to_worker using an asyncssh connection.
+    Requires the 'asyncssh' package (included in the 'prefect-full' extras).
+
+    Mirrors the sync path's failure handling: a non-zero exit status or a
+    missing result line raises a RuntimeError carrying the stderr.
+    """
+    import asyncssh
+    async with asyncssh.connect(worker_address) as conn:
+        result = await conn.run(
+            " ".join(_remote_worker_command(command_to_run)), check=False
+        )
+    lines = result.stdout.strip().splitlines()
+    if result.exit_status != 0 or not lines:
+        raise RuntimeError(
+            f"worker dispatch to {worker_address} failed: {result.stderr.strip()}"
+        )
+    # The worker prints its result as the final JSON line
+    return json.loads(lines[-1])
+
+def deploy_tasks_to_workers(mapping: dict) -> dict:
+    """
+    Fan a batch of commands out to many workers concurrently.
+
+    Each worker gets its own asyncssh connection and all commands run in
+    parallel via asyncio.gather, so a 10-worker dispatch costs roughly the
+    wall-clock of the slowest task instead of the sum of all of them.
+
+    Args:
+        mapping: {worker_address: command_to_run}
+
+    Returns:
+        {worker_address: worker result dict}. A worker whose dispatch
+        failed maps to the raised exception instead of aborting the whole
+        fan-out and discarding the other workers' results.
+    """
+    async def _deploy_all():
+        results = await asyncio.gather(
+            *(deploy_task_to_worker_async(addr, cmd) for addr, cmd in mapping.items()),
+            return_exceptions=True,
+        )
+        return dict(zip(mapping, results))
+
+    return asyncio.run(_deploy_all())
+
 @task(name="Request Manual Approval via Slack")
 def request_slack_approval(prompt: str, channel: str = None) -> str:
     """
@@ -1,13 +1,19 @@
 import os
+import functools
 
+@functools.cache
 def is_worker_node() -> bool:
-    """Check if the current device is a resource-constrained worker node."""
+    """Check if the current device is a resource-constrained worker node.
+
+    The device-tree model cannot change while the process runs, so the
+    result is memoized and the file is read at most once per process.
+    """
     try:
         if os.path.exists('/proc/device-tree/model'):
             with open('/proc/device-tree/model', 'r') as f:
                 model = f.read()
                 # Add other lightweight devices here if needed
-                return 'Zero' in model
+                return model.startswith('Raspberry Pi Zero')
     except Exception:
         # Not a Linux-based system with a device tree, so assume it's a full node.
         return False
@@ -0,0 +1,60 @@
+"""
+Minimal task runner for SDL worker nodes
+Author: Yang Cao, Acceleration Consortium
+Version: 0.1
+
+Executed on a worker node (usually over SSH by the orchestrator) as:
+    python -m sdl_utils.prefect_worker <command> [args...]
+
+Deliberately imports nothing heavy (no prefect, no requests): workers are
+invoked once per task, so every import here is paid on each invocation.
+
+A list of functions:
+ - execute_remote_task
+"""
+
+import sys
+import json
+import threading
+import subprocess
+
+
+def execute_remote_task(argv):
+    """Run 'argv' directly and return the outcome as a dict.
+
+    The command is executed as an argv list with no shell, so no /bin/sh
+    is forked and no shell quoting applies. Each stdout line the command
+    produces is echoed (and flushed) as it arrives, so the orchestrator's
+    streaming loop shows progress live instead of seeing everything at
+    exit; the lines are also collected for the returned dict.
+
+    :param argv: the command and its arguments as a list
+    :return: dict with returncode, stdout and stderr
+    """
+    stdout_lines = []
+    stderr_chunks = []
+    with subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    ) as proc:
+        # Drain stderr concurrently so a chatty command cannot fill its
+        # stderr pipe and stall while stdout is being streamed
+        drain = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+        )
+        drain.start()
+        for line in proc.stdout:
+            print(line, end="", flush=True)
+            stdout_lines.append(line)
+        drain.join()
+    return {
+        "returncode": proc.returncode,
+        "stdout": "".join(stdout_lines),
+        "stderr": "".join(stderr_chunks),
+    }
+
+
+if __name__ == "__main__":
+    outcome = execute_remote_task(sys.argv[1:])
+    # The orchestrator parses this single JSON line for the task result
+    print(json.dumps(outcome))
+    sys.exit(outcome["returncode"])
@@ -1,5 +1,6 @@
 import os
 import time
+import threading
 
 try:
     from slack_sdk import WebClient
@@ -18,12 +19,26 @@ except ImportError:
 # Fetch the Slack token and default channel from environment variables.
 # It's best practice to not hardcode these.
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
+# App-level token; when set, approval responses arrive as push events over
+# Socket Mode instead of being polled for.
+SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN")
 DEFAULT_SLACK_CHANNEL = os.environ.get("DEFAULT_SLACK_CHANNEL", "#general")
 
 # Initialize the Slack client globally.
 # If the token is not set, client operations will fail gracefully.
 slack_client = WebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
 
+# Only the prompt text varies between approval requests, so the button
+# elements are built once at import (a tuple, so they stay immutable)
+_APPROVAL_BUTTONS = (
+    {"type": "button", "text": {"type": "plain_text", "text": "Approve"}, "style": "primary", "value": "approve"},
+    {"type": "button", "text": {"type": "plain_text", "text": "Deny"}, "style": "danger", "value": "deny"},
+)
+
+# Reaction names that decide an approval request
+_APPROVED_REACTIONS = {"+1"}
+_DENIED_REACTIONS = {"-1"}
+
 def send_slack_message(message: str, channel: str = None) -> dict:
     """Sends a simple text message to a Slack channel."""
     if not slack_client:
@@ -48,7 +63,7 @@ def ask_for_approval(prompt: str, channel: str = None) -> dict:
         return {}
 
     target_channel = channel or DEFAULT_SLACK_CHANNEL
-    
+
     block = [
         {
             "type": "section",
@@ -56,13 +71,10 @@ def ask_for_approval(prompt: str, channel: str = None) -> dict:
         },
         {
             "type": "actions",
-            "elements": [
-                {"type": "button", "text": {"type": "plain_text", "text": "Approve"}, "style": "primary", "value": "approve"},
-                {"type": "button", "text": {"type": "plain_text", "text": "Deny"}, "style": "danger", "value": "deny"},
-            ],
+            "elements": list(_APPROVAL_BUTTONS),
         },
     ]
-    
+
     try:
         response = slack_client.chat_postMessage(channel=target_channel, blocks=block)
         return response.data
@@ -72,15 +84,65 @@ def ask_for_approval(prompt: str, channel: str = None) -> dict:
 
 def await_approval_response(message_ts: str, channel: str, timeout_seconds: int = 300) -> str:
     """
-    Waits for a user to react to a message with a specific reaction.
-    This is a simplified, polling-based way to get feedback.
-    
+    Waits for a user to react to the approval message.
+
+    When SLACK_APP_TOKEN is set, the decision arrives as a reaction_added
+    push event over Slack Socket Mode the moment the user reacts — no
+    polling traffic and near-zero response latency. Without an app token
+    this falls back to polling conversations_history every 5 seconds.
+
     Returns: 'approved', 'denied', or 'timeout'.
     """
     if not slack_client:
         print("Warning: Slack client not initialized. Set SLACK_BOT_TOKEN.")
         return "timeout"
-        
+
+    if SLACK_APP_TOKEN:
+        try:
+            return _await_via_socket_mode(message_ts, timeout_seconds)
+        except Exception as e:
+            print(f"Socket Mode unavailable ({e}), falling back to polling.")
+
+    return _await_via_polling(message_ts, channel, timeout_seconds)
+
+
+def _await_via_socket_mode(message_ts: str, timeout_seconds: int) -> str:
+    """Wait for a reaction_added event on the approval message via Socket Mode."""
+    from slack_sdk.socket_mode import SocketModeClient
+    from slack_sdk.socket_mode.response import SocketModeResponse
+
+    decided = threading.Event()
+    decision_holder = [None]
+
+    def _handle(client: "SocketModeClient", req) -> None:
+        # Always ack so Slack does not redeliver the envelope
+        client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
+        if req.type != "events_api":
+            return
+        event = req.payload.get("event", {})
+        if event.get("type") != "reaction_added":
+            return
+        if event.get("item", {}).get("ts") != message_ts:
+            return
+        if event.get("reaction") in _APPROVED_REACTIONS:
+            decision_holder[0] = "approved"
+            decided.set()
+        elif event.get("reaction") in _DENIED_REACTIONS:
+            decision_holder[0] = "denied"
+            decided.set()
+
+    sm_client = SocketModeClient(app_token=SLACK_APP_TOKEN, web_client=slack_client)
+    sm_client.socket_mode_request_listeners.append(_handle)
+    sm_client.connect()
+    try:
+        decided.wait(timeout_seconds)
+    finally:
+        sm_client.close()
+    return decision_holder[0] or "timeout"
+
+
+def _await_via_polling(message_ts: str, channel: str, timeout_seconds: int) -> str:
+    """Poll conversations_history for a +1/-1 reaction on the approval message."""
     start_time = time.time()
     while time.time() - start_time < timeout_seconds:
         try:
@@ -93,9 +155,9 @@ def await_approval_response(message_ts: str, channel: str, timeout_seconds: int
             message = result['messages'][0]
             if 'reactions' in message:
                 for reaction in message['reactions']:
-                    if reaction['name'] == '+1': # :+1: emoji means approved
+                    if reaction['name'] in _APPROVED_REACTIONS: # :+1: emoji means approved
                         return "approved"
-                    if reaction['name'] == '-1': # :-1: emoji means denied
+                    if reaction['name'] in _DENIED_REACTIONS: # :-1: emoji means denied
                         return "denied"
 
         except SlackApiError as e:
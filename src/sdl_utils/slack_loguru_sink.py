@@ -1,29 +1,70 @@
-from slack_sdk import WebClient
 import os
+import time
+import queue
+import functools
+import threading
 
 class SlackLoguruSink:
-    """A Loguru sink to send log messages to a Slack channel."""
-    def __init__(self, token: str, channel: str):
+    """A Loguru sink that posts log messages to Slack off the logging thread.
+
+    Records are buffered in a bounded queue and a daemon thread posts them
+    in batches, so the logging caller returns immediately instead of
+    blocking on a Slack HTTP round trip per record.
+    """
+    def __init__(self, token: str, channel: str, max_queue: int = 1000):
+        # Import lazily so merely importing this module never pays for
+        # slack_sdk (or fails when the 'full' extras are not installed)
+        from slack_sdk import WebClient
         self.client = WebClient(token=token)
         self.channel = channel
+        self._q = queue.Queue(maxsize=max_queue)
+        threading.Thread(target=self._drain, daemon=True).start()
 
     def __call__(self, message):
         """This method is called by Loguru to process a log record."""
         try:
             # We are interested in the pre-formatted log message
-            log_entry = message.strip()
-            self.client.chat_postMessage(channel=self.channel, text=log_entry)
-        except Exception as e:
-            # Avoid crashing the application if logging to Slack fails
-            print(f"Error sending log to Slack: {e}")
+            self._q.put_nowait(str(message).strip())
+        except queue.Full:
+            # Dropping a record beats blocking the application on Slack
+            pass
 
+    def _drain(self):
+        """Post queued records, coalescing up to 20 per Slack call."""
+        while True:
+            batch = [self._q.get()]
+            deadline = time.monotonic() + 0.5
+            while len(batch) < 20:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.client.chat_postMessage(channel=self.channel, text="\n".join(batch))
+            except Exception as e:
+                # Avoid crashing the application if logging to Slack fails
+                print(f"Error sending log to Slack: {e}")
+
+@functools.cache
 def get_slack_sink():
     """
     Factory function to create a Slack sink if configured via environment variables.
     Returns the sink instance or None if not configured.
+
+    The sink is only built when SDL_ENABLE_SLACK_SINK=1, so startup costs
+    nothing unless Slack logging is explicitly enabled, and the result is
+    cached so repeated calls share one WebClient. Register with Loguru
+    using enqueue=True so even the queue handoff happens on Loguru's
+    background thread:
+        logger.add(get_slack_sink(), level="ERROR", enqueue=True)
     """
+    if os.environ.get("SDL_ENABLE_SLACK_SINK") != "1":
+        return None
     token = os.environ.get("SLACK_BOT_TOKEN")
     channel = os.environ.get("SLACK_LOGGING_CHANNEL")
     if token and channel:
         return SlackLoguruSink(token=token, channel=channel)
-    return None 
+    return None